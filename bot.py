@@ -8,8 +8,9 @@ from aiogram.enums import ParseMode
 from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.fsm.storage.redis import RedisStorage, DefaultKeyBuilder
 
-from tgbot.config import load_config
+from tgbot.config import current_config, load_config
 from tgbot.handlers import routers_list
+from tgbot.middlewares.throttling import ThrottlingMiddleware
 from tgbot.services import broadcaster
 
 
@@ -17,17 +18,22 @@ async def on_startup(bot: Bot, admin_ids: list[int]):
     await broadcaster.broadcast(bot, admin_ids, "Бот був запущений")
 
 
-def register_global_middlewares(dp: Dispatcher, session_pool=None):
+def register_global_middlewares(dp: Dispatcher, config=None, session_pool=None):
     """
     Register global middlewares for the given dispatcher.
     Global middlewares here are the ones that are applied to all the handlers (you specify the type of update)
 
     :param dp: The dispatcher instance.
     :type dp: Dispatcher
+    :param config: Optional Config object; falls back to the memoized load_config().
     :param session_pool: Optional session pool object for the database using SQLAlchemy.
     :return: None
     """
     middleware_types = [
+        # Config is injected once through workflow_data (see main), so the
+        # per-event ConfigMiddleware is only needed if you wire the
+        # dispatcher differently:
+        # ConfigMiddleware(config),
         # DatabaseMiddleware(session_pool),
     ]
 
@@ -35,6 +41,9 @@ def register_global_middlewares(dp: Dispatcher, session_pool=None):
         dp.message.outer_middleware(middleware_type)
         dp.callback_query.outer_middleware(middleware_type)
 
+    # Throttling only makes sense for messages (it is keyed by chat id)
+    dp.message.middleware(ThrottlingMiddleware())
+
 
 def setup_logging():
     """
@@ -75,7 +84,7 @@ def get_storage(config):
     """
     if config.tg_bot.use_redis:
         return RedisStorage.from_url(
-            config.redis.dsn(),
+            config.redis.dsn,
             key_builder=DefaultKeyBuilder(with_bot_id=True, with_destiny=True),
         )
     else:
@@ -86,6 +95,9 @@ async def main():
     setup_logging()
 
     config = load_config()
+    # Publish the config process-wide for code that is not on the handler
+    # DI path (services, jobs); ContextVar.get is a C-level read
+    current_config.set(config)
     storage = get_storage(config)
 
     default = DefaultBotProperties(parse_mode=ParseMode.HTML)
@@ -94,9 +106,11 @@ async def main():
 
     dp.include_routers(*routers_list)
 
-    register_global_middlewares(dp)
+    register_global_middlewares(dp, config)
 
     await on_startup(bot, config.tg_bot.admin_ids)
+    # config lands in the dispatcher's workflow_data once here, so handlers
+    # receive it via DI without any per-event middleware work
     await dp.start_polling(bot, config=config)
 
 
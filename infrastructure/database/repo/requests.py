@@ -3,7 +3,6 @@ from dataclasses import dataclass
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from infrastructure.database.repo.users import UserRepo
-from infrastructure.database.setup import create_engine
 
 
 @dataclass
@@ -25,7 +24,7 @@ class RequestsRepo:
 
 
 if __name__ == "__main__":
-    from infrastructure.database.setup import create_session_pool
+    from infrastructure.database.setup import create_engine, create_session_pool
     from tgbot.config import Config
 
     async def example_usage(config: Config):
@@ -48,3 +47,7 @@ if __name__ == "__main__":
                 language="en",
                 username="johndoe",
             )
+
+            # Repo methods do not commit; the session owner does (closing
+            # the session without committing rolls the write back)
+            await session.commit()
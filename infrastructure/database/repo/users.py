@@ -1,12 +1,109 @@
 import logging
-from typing import Optional
+import time
+import weakref
+from itertools import islice
+from typing import Dict, Optional, Tuple
 
+from sqlalchemy import event
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import SQLAlchemyError
 
 from infrastructure.database.models import User
 from infrastructure.database.repo.base import BaseRepo
 
+# The user UPSERT is identical on every call except for its parameter
+# values, so build the Core construct once at import time. execute() gets
+# the row as a plain mapped-column parameter dict — which is what the ORM
+# insert path binds as the VALUES — while the DO UPDATE SET clause takes
+# its values from the proposed row via EXCLUDED, so no extra bind
+# parameters are involved.
+_INSERT_USER = insert(User)
+_UPSERT_USER = (
+    _INSERT_USER.on_conflict_do_update(
+        index_elements=[User.user_id],
+        set_={
+            "username": _INSERT_USER.excluded.username,
+            "full_name": _INSERT_USER.excluded.full_name,
+        },
+    )
+    .returning(User)
+    # Refresh an already identity-mapped User from the RETURNING row, so a
+    # conflict-update never hands back stale attributes
+    .execution_options(populate_existing=True)
+)
+
+# Recently upserted users, keyed by user id. Each entry holds the monotonic
+# expiry time, the exact (full_name, username, language) tuple that was
+# written and the returned User, so repeat messages from the same user skip
+# the UPSERT round-trip until the window lapses or their profile changes.
+_RECENT_USERS_TTL = 300.0
+_RECENT_USERS_MAX = 100_000
+# How many of the oldest entries to evict when the cache is full but nothing
+# has expired; evicting a batch keeps the full-cache scan amortized instead
+# of repeating per confirmation.
+_RECENT_USERS_EVICT = _RECENT_USERS_MAX // 10
+_recent_users: Dict[int, Tuple[float, tuple, User]] = {}
+
+# Entries staged per session (keyed by session id) until the owning
+# transaction is durable: the repo does not commit, so a cache write at
+# execute() time could outlive a rollback and serve phantom users. The
+# session's own commit/rollback events confirm or discard the staging.
+_pending_users: Dict[int, Dict[int, Tuple[float, tuple, User]]] = {}
+
+# Sessions that already carry the confirm/discard listeners below
+_tracked_sessions: "weakref.WeakSet" = weakref.WeakSet()
+
+
+def _confirm_pending(session_key: int) -> None:
+    """Promotes the entries staged under this session key into the cache."""
+    staged = _pending_users.pop(session_key, None)
+    if not staged:
+        return
+    if len(_recent_users) >= _RECENT_USERS_MAX:
+        # Drop expired entries first
+        now = time.monotonic()
+        expired = [uid for uid, entry in _recent_users.items() if entry[0] <= now]
+        for uid in expired:
+            del _recent_users[uid]
+        if len(_recent_users) >= _RECENT_USERS_MAX:
+            # Nothing expired (all entries still inside the TTL): evict the
+            # oldest batch in insertion order so the bound actually holds
+            # and the next confirmations skip the scan entirely
+            for uid in list(islice(_recent_users, _RECENT_USERS_EVICT)):
+                del _recent_users[uid]
+    _recent_users.update(staged)
+
+
+def _discard_pending(session_key: int) -> None:
+    """Drops the entries staged under this session key."""
+    _pending_users.pop(session_key, None)
+
+
+def _stage_pending_user(session, user_id: int, entry: Tuple[float, tuple, User]) -> None:
+    """
+    Stages a cache entry until this session's transaction is durable.
+
+    Confirmation and discard ride on the session's own after_commit /
+    after_(soft_)rollback events, so every session owner is covered — the
+    middleware, the example snippet and custom jobs alike — without having
+    to call anything besides commit() or rollback(). A finalizer clears the
+    staging if the session is dropped without ending its transaction, before
+    its id can be recycled for a new session.
+    """
+    if session not in _tracked_sessions:
+        key = id(session)
+        sync_session = getattr(session, "sync_session", session)
+        event.listen(sync_session, "after_commit", lambda s: _confirm_pending(key))
+        event.listen(sync_session, "after_rollback", lambda s: _discard_pending(key))
+        event.listen(
+            sync_session,
+            "after_soft_rollback",
+            lambda s, previous: _discard_pending(key),
+        )
+        weakref.finalize(session, _discard_pending, key)
+        _tracked_sessions.add(session)
+    _pending_users.setdefault(id(session), {})[user_id] = entry
+
 
 class UserRepo(BaseRepo):
     async def get_or_create_user(
@@ -19,44 +116,40 @@ class UserRepo(BaseRepo):
         """
         Creates or updates a new user in the database and returns the user object.
         Only fields provided as parameters will be updated in the case of a conflict.
+
+        The method does not commit: the caller (e.g. DatabaseMiddleware) owns the
+        transaction, so several repo calls can share a single COMMIT round-trip.
+
         :param user_id: The user's ID.
         :param full_name: The user's full name.
         :param language: The user's language.
         :param username: The user's username. It's an optional parameter.
         :return: User object, None if there was an error while making a transaction.
         """
+        profile = (full_name, username, language)
+        now = time.monotonic()
+        cached = _recent_users.get(user_id)
+        if cached is not None and cached[0] > now and cached[1] == profile:
+            return cached[2]
+
         try:
 
-            insert_stmt = (
-                insert(User)
-                .values(
-                    user_id=user_id,
-                    username=username,
-                    full_name=full_name,
-                    language=language,
-                )
-                .on_conflict_do_update(
-                    index_elements=[User.user_id],
-                    set_=dict(
-                        username=username,
-                        full_name=full_name,
-                    ),
-                )
-                .returning(User)
+            result = await self.session.execute(
+                _UPSERT_USER,
+                {
+                    "user_id": user_id,
+                    "username": username,
+                    "full_name": full_name,
+                    "language": language,
+                },
             )
-            result = await self.session.execute(insert_stmt)
 
-            await self.session.commit()
-            return result.scalar_one()
+            user = result.scalar_one_or_none()
+            _stage_pending_user(
+                self.session, user_id, (now + _RECENT_USERS_TTL, profile, user)
+            )
+            return user
         except SQLAlchemyError as e:
-            await self.session.rollback()
-            # Log the error or re-raise with additional information if necessary
-            logging.error(f"Failed to insert or update user: {e}")
-            raise Exception("Failed to insert or update user in the database.") from e
-        except Exception as e:
-            await self.session.rollback()
-            # Handle other exceptions, possibly re-raise
-            logging.error(f"An unexpected error occurred: {e}")
-            raise Exception(
-                "An unexpected error occurred during database operations."
-            ) from e
+            # %s formatting defers interpolation until the record is emitted
+            logging.error("Failed to insert or update user: %s", e)
+            raise
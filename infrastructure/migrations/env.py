@@ -33,7 +33,7 @@ db_config = load_config().db
 
 config.set_main_option(
     "sqlalchemy.url",
-    db_config.construct_sqlalchemy_url(),
+    db_config.sqlalchemy_url,
 )
 
 
@@ -1,7 +1,12 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 from aiogram.filters import BaseFilter
 from aiogram.types import Message
 
-from tgbot.config import Config
+if TYPE_CHECKING:
+    from tgbot.config import Config
 
 
 class AdminFilter(BaseFilter):
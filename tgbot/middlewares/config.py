@@ -0,0 +1,27 @@
+from typing import Callable, Dict, Any, Awaitable, Optional
+
+from aiogram import BaseMiddleware
+from aiogram.types import Message
+
+from tgbot.config import Config, current_config, load_config
+
+
+class ConfigMiddleware(BaseMiddleware):
+    def __init__(self, config: Optional[Config] = None) -> None:
+        # Fall back to the config main() published process-wide, then to
+        # the memoized load_config(); neither re-parses the .env file.
+        if config is None:
+            config = current_config.get() or load_config()
+        self.config = config
+        # Prebuilt payload: injecting it is a single C-level dict.update
+        # per event instead of a subscript assignment.
+        self._payload = {"config": self.config}
+
+    async def __call__(
+        self,
+        handler: Callable[[Message, Dict[str, Any]], Awaitable[Any]],
+        event: Message,
+        data: Dict[str, Any],
+    ) -> Any:
+        data.update(self._payload)
+        return await handler(event, data)
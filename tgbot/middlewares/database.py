@@ -31,5 +31,15 @@ class DatabaseMiddleware(BaseMiddleware):
             data["repo"] = repo
             data["user"] = user
 
-            result = await handler(event, data)
+            # The middleware owns the transaction: everything a handler did
+            # with the session is committed once here, instead of every repo
+            # method paying its own COMMIT round-trip. The repo's user-cache
+            # staging listens on the session's commit/rollback events, so no
+            # extra bookkeeping is needed on either path.
+            try:
+                result = await handler(event, data)
+            except Exception:
+                await session.rollback()
+                raise
+            await session.commit()
         return result
@@ -0,0 +1,103 @@
+import time
+from array import array
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.flags import get_flag
+from aiogram.types import Message
+
+# Bound once so the hot path pays a global load instead of a module
+# attribute lookup per message
+_monotonic = time.monotonic
+
+# Sentinel distinguishing "handler not seen yet" from "handler has no flag"
+_UNSET = object()
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    """
+    Drops messages from chats that were already seen within the throttle
+    window of the handler's ``rate_limit`` flag.
+
+    Each throttle key owns a fixed ring of 65536 monotonic expiry floats
+    in an ``array('d')``; a chat id is admitted only when both of its
+    hashed slots have expired, and admission stamps both slots. Slot
+    collisions can throttle an innocent chat a bit early, which is
+    acceptable for rate limiting, and the double hash keeps that rare.
+
+    Flags are declared at handler-definition time, so the first message a
+    handler receives compiles a checker closure with its ring, TTL and
+    mask baked in as locals. Every later message resolves that checker
+    with a single dict lookup — no flag introspection, no per-key lookups.
+    """
+
+    ttls: Dict[str, float] = {"default": 2.0}
+
+    # Power of two, so `chat_id & mask` indexes directly; 65536 doubles
+    # is 512 KiB per throttle key.
+    _SLOT_COUNT = 65536
+
+    # Knuth's multiplicative hash constant for the second probe
+    _HASH_MULTIPLIER = 2654435761
+
+    def __init__(self) -> None:
+        self._mask = self._SLOT_COUNT - 1
+        self._default_ttl = self.ttls["default"]
+        self._slots: Dict[str, array] = {
+            "default": array("d", [0.0]) * self._SLOT_COUNT
+        }
+        # Compiled checker (or None for unflagged handlers) per registered
+        # handler object. Handlers live as long as their router, so keying
+        # by id() is stable for the process lifetime.
+        self._compiled: Dict[int, Optional[Callable[[int], bool]]] = {}
+
+    def _compile_checker(self, cache_key: str) -> Callable[[int], bool]:
+        """
+        Builds a throttle checker for one key with every lookup the hot path
+        would otherwise repeat — ring, TTL, mask, clock — bound as closure
+        locals. Returns True when the chat should be throttled.
+        """
+        slots = self._slots.get(cache_key)
+        if slots is None:
+            slots = self._slots[cache_key] = array("d", [0.0]) * self._SLOT_COUNT
+        ttl = self.ttls.get(cache_key, self._default_ttl)
+        mask = self._mask
+        multiplier = self._HASH_MULTIPLIER
+        monotonic = _monotonic
+
+        def check(chat_id: int) -> bool:
+            first = chat_id & mask
+            second = (chat_id * multiplier) & mask
+            now = monotonic()
+            if slots[first] > now and slots[second] > now:
+                return True
+            expires_at = now + ttl
+            slots[first] = expires_at
+            slots[second] = expires_at
+            return False
+
+        return check
+
+    async def __call__(
+        self,
+        handler: Callable[[Message, Dict[str, Any]], Awaitable[Any]],
+        event: Message,
+        data: Dict[str, Any],
+    ) -> Any:
+        handler_obj = data.get("handler")
+        if handler_obj is None:
+            return await handler(event, data)
+
+        check = self._compiled.get(id(handler_obj), _UNSET)
+        if check is _UNSET:
+            flag = get_flag(data, "rate_limit")
+            check = (
+                None
+                if flag is None
+                else self._compile_checker(flag.get("key", "default"))
+            )
+            self._compiled[id(handler_obj)] = check
+
+        if check is not None and check(event.chat.id):
+            return
+        return await handler(event, data)